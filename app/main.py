@@ -1,20 +1,75 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from typing import List, Optional
+from sqlalchemy import lambda_stmt, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only, raiseload
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
+from time import monotonic
+import asyncio
 import os
 
-from app.database import get_session, init_db
+from app.database import async_session_maker, get_session, init_db
 from app.models import ReadingListItem, Settings
 from app.safari_reader import extract_reading_list, get_default_bookmarks_path
-from app.summarizer import fetch_webpage_content, summarize_with_llm
+from app.summarizer import close_http_client, fetch_webpage_content, load_tokenizer
+from app.summary_cache import cached_summary
 from pydantic import BaseModel
 
 app = FastAPI(title="Reading List Processor")
 
+# Maximum number of rows per INSERT statement during sync (keeps bound
+# parameters under SQLite's 999 variable limit on older builds)
+SYNC_BATCH_SIZE = 150
+
+# Maximum number of items processed concurrently by /api/process, sized to
+# the LLM provider's rate limit
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 5))
+
+# Settings rows cached in-process as (value, fetched_at); refreshed on update.
+# Only valid for a single worker process.
+SETTINGS_CACHE_TTL = 60
+_settings_cache: Dict[str, Tuple[Optional[str], float]] = {}
+
+# In debug mode, list queries raise on any lazy relationship load so N+1s
+# surface during development. New relationships must be loaded explicitly
+# with selectinload/joinedload.
+DEBUG = os.getenv('DEBUG', '').lower() in ('1', 'true')
+
+
+def list_query_options():
+    """Loader options applied to queries that return many items"""
+    return [raiseload("*")] if DEBUG else []
+
+
+def item_by_id_stmt(item_id: int):
+    """Cached SELECT for a single reading list item"""
+    return lambda_stmt(lambda: select(ReadingListItem).where(ReadingListItem.id == item_id))
+
+
+def setting_by_key_stmt(key: str):
+    """Cached SELECT for a single settings row"""
+    return lambda_stmt(lambda: select(Settings).where(Settings.key == key))
+
+
+async def get_custom_instructions(session: AsyncSession) -> Optional[str]:
+    """Get the saved custom instructions, served from memory for up to SETTINGS_CACHE_TTL seconds"""
+    cached = _settings_cache.get('custom_instructions')
+    if cached and monotonic() - cached[1] < SETTINGS_CACHE_TTL:
+        return cached[0]
+
+    result = await session.execute(
+        setting_by_key_stmt('custom_instructions')
+    )
+    settings = result.scalar_one_or_none()
+    value = settings.value if settings else None
+
+    _settings_cache['custom_instructions'] = (value, monotonic())
+    return value
+
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -22,6 +77,12 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 @app.on_event("startup")
 async def startup_event():
     await init_db()
+    await asyncio.to_thread(load_tokenizer)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_http_client()
 
 
 class ProcessRequest(BaseModel):
@@ -42,10 +103,35 @@ async def read_root():
 
 @app.get("/api/items")
 async def get_items(session: AsyncSession = Depends(get_session)):
-    """Get all reading list items from database"""
-    result = await session.execute(select(ReadingListItem))
+    """Get all reading list items from database (without their fetched content)"""
+    result = await session.execute(
+        select(ReadingListItem).options(*list_query_options(), load_only(
+            ReadingListItem.id,
+            ReadingListItem.url,
+            ReadingListItem.title,
+            ReadingListItem.preview_text,
+            ReadingListItem.summary,
+            ReadingListItem.processed,
+            ReadingListItem.added_date,
+            ReadingListItem.processed_date,
+        ))
+    )
     items = result.scalars().all()
-    return [item.to_dict() for item in items]
+    return [item.to_dict(include_content=False) for item in items]
+
+
+@app.get("/api/items/{item_id}")
+async def get_item(item_id: int, session: AsyncSession = Depends(get_session)):
+    """Get a single reading list item including its fetched content"""
+    result = await session.execute(
+        item_by_id_stmt(item_id)
+    )
+    item = result.scalar_one_or_none()
+
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+
+    return item.to_dict()
 
 
 @app.post("/api/sync")
@@ -63,29 +149,111 @@ async def sync_reading_list(session: AsyncSession = Depends(get_session)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading Safari bookmarks: {str(e)}")
 
+    # Items without a Safari date share one timestamp for the whole sync
+    batch_now = datetime.utcnow()
+    rows = [
+        {
+            "url": item['url'],
+            "title": item['title'] or item['url'],
+            "preview_text": item['preview_text'],
+            "added_date": item['added_date'] if item['added_date'] else batch_now,
+        }
+        for item in reading_list
+    ]
+
+    # Insert in batches and let SQLite skip URLs that already exist
     new_count = 0
-    for item in reading_list:
-        # Check if URL already exists
-        result = await session.execute(
-            select(ReadingListItem).where(ReadingListItem.url == item['url'])
-        )
-        existing = result.scalar_one_or_none()
-
-        if not existing:
-            new_item = ReadingListItem(
-                url=item['url'],
-                title=item['title'] or item['url'],
-                preview_text=item['preview_text'],
-                added_date=item['added_date'] if item['added_date'] else datetime.utcnow()
-            )
-            session.add(new_item)
-            new_count += 1
+    for i in range(0, len(rows), SYNC_BATCH_SIZE):
+        stmt = sqlite_insert(ReadingListItem.__table__).values(
+            rows[i:i + SYNC_BATCH_SIZE]
+        ).on_conflict_do_nothing(index_elements=['url'])
+        result = await session.execute(stmt)
+        new_count += result.rowcount
 
     await session.commit()
 
     return {"message": f"Synced {new_count} new items", "new_items": new_count}
 
 
+class FetchError(Exception):
+    """Raised when a reading list item's page could not be fetched"""
+
+
+async def _process_one(
+    item: ReadingListItem,
+    custom_instructions: Optional[str],
+    refetch: bool,
+    processed_date: datetime,
+    semaphore: asyncio.Semaphore
+) -> Dict:
+    """
+    Fetch and summarize a single item.
+
+    Returns:
+        Column values to write back for the item, keyed by column name
+    """
+    async with semaphore:
+        values = {"id": item.id}
+        content = item.content
+
+        # Fetch content
+        if not content or refetch:
+            content = await fetch_webpage_content(item.url)
+            if not content:
+                raise FetchError(f"Failed to fetch content for {item.url}")
+            values["content"] = content
+
+        # Summarize, reusing a cached summary for identical input
+        summary = "".join([text async for text in cached_summary(content, custom_instructions)])
+
+        values.update(summary=summary, processed=True, processed_date=processed_date)
+        return values
+
+
+def _sse(data: str, event: Optional[str] = None) -> str:
+    """Format a server-sent event frame"""
+    frame = f"event: {event}\n" if event else ""
+    frame += "".join(f"data: {line}\n" for line in data.split("\n"))
+    return frame + "\n"
+
+
+async def _stream_one(item_id: int, url: str, custom_instructions: Optional[str]) -> AsyncIterator[str]:
+    """
+    Fetch and summarize a single item, yielding the summary as server-sent events.
+
+    The item is only updated once the full summary has been generated. Errors are
+    sent as an "error" event and a final "done" event marks success.
+    """
+    try:
+        content = await fetch_webpage_content(url)
+        if not content:
+            yield _sse(f"Failed to fetch content for {url}", event="error")
+            return
+
+        # Summarize, reusing a cached summary for identical input
+        chunks = []
+        async for text in cached_summary(content, custom_instructions, stream=True):
+            chunks.append(text)
+            yield _sse(text)
+        summary = "".join(chunks)
+
+        # The request's session is closed once streaming starts, so use a fresh one
+        async with async_session_maker() as session:
+            await session.execute(update(ReadingListItem), [{
+                "id": item_id,
+                "content": content,
+                "summary": summary,
+                "processed": True,
+                "processed_date": datetime.utcnow(),
+            }])
+            await session.commit()
+
+        yield _sse("", event="done")
+
+    except Exception as e:
+        yield _sse(f"Error processing {url}: {str(e)}", event="error")
+
+
 @app.post("/api/process")
 async def process_items(
     request: ProcessRequest,
@@ -96,57 +264,55 @@ async def process_items(
     # Get custom instructions from settings if not provided
     custom_instructions = request.custom_instructions
     if not custom_instructions:
-        result = await session.execute(
-            select(Settings).where(Settings.key == 'custom_instructions')
-        )
-        settings = result.scalar_one_or_none()
-        if settings:
-            custom_instructions = settings.value
+        custom_instructions = await get_custom_instructions(session)
 
     if request.item_id:
         # Process single item
         result = await session.execute(
-            select(ReadingListItem).where(ReadingListItem.id == request.item_id)
+            item_by_id_stmt(request.item_id)
         )
         item = result.scalar_one_or_none()
 
         if not item:
             raise HTTPException(status_code=404, detail="Item not found")
 
-        items_to_process = [item]
-    else:
-        # Process all unprocessed items (or all if reprocess=True)
-        if request.reprocess:
-            result = await session.execute(select(ReadingListItem))
-        else:
-            result = await session.execute(
-                select(ReadingListItem).where(ReadingListItem.processed == False)
-            )
-        items_to_process = result.scalars().all()
+        # Stream the summary back as it is generated
+        return StreamingResponse(
+            _stream_one(item.id, item.url, custom_instructions),
+            media_type="text/event-stream"
+        )
+
+    # Process all unprocessed items (or all if reprocess=True)
+    stmt = select(ReadingListItem).options(*list_query_options())
+    if not request.reprocess:
+        stmt = stmt.where(ReadingListItem.processed == False)
+    result = await session.execute(stmt)
+    items_to_process = result.scalars().all()
+
+    semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    # Every item in the batch gets the same processed_date
+    batch_now = datetime.utcnow()
+    refetch = request.reprocess
+
+    results = await asyncio.gather(
+        *(_process_one(item, custom_instructions, refetch, batch_now, semaphore) for item in items_to_process),
+        return_exceptions=True
+    )
 
-    processed_count = 0
+    updates = []
     errors = []
+    for item, result in zip(items_to_process, results):
+        if isinstance(result, FetchError):
+            errors.append(str(result))
+        elif isinstance(result, Exception):
+            errors.append(f"Error processing {item.url}: {str(result)}")
+        else:
+            updates.append(result)
+    processed_count = len(updates)
 
-    for item in items_to_process:
-        try:
-            # Fetch content
-            if not item.content or request.reprocess or request.item_id:
-                content = fetch_webpage_content(item.url)
-                if content:
-                    item.content = content
-                else:
-                    errors.append(f"Failed to fetch content for {item.url}")
-                    continue
-
-            # Summarize
-            summary = summarize_with_llm(item.content, custom_instructions)
-            item.summary = summary
-            item.processed = True
-            item.processed_date = datetime.utcnow()
-            processed_count += 1
-
-        except Exception as e:
-            errors.append(f"Error processing {item.url}: {str(e)}")
+    # Write all results with one bulk UPDATE by primary key
+    if updates:
+        await session.execute(update(ReadingListItem), updates)
 
     await session.commit()
 
@@ -160,13 +326,10 @@ async def process_items(
 @app.get("/api/settings")
 async def get_settings(session: AsyncSession = Depends(get_session)):
     """Get application settings"""
-    result = await session.execute(
-        select(Settings).where(Settings.key == 'custom_instructions')
-    )
-    settings = result.scalar_one_or_none()
+    custom_instructions = await get_custom_instructions(session)
 
     return {
-        "custom_instructions": settings.value if settings else ""
+        "custom_instructions": custom_instructions or ""
     }
 
 
@@ -177,21 +340,21 @@ async def update_settings(
 ):
     """Update application settings"""
 
-    # Update or create custom instructions
+    # Update or create custom instructions in a single atomic UPSERT
     if settings_update.custom_instructions is not None:
-        result = await session.execute(
-            select(Settings).where(Settings.key == 'custom_instructions')
+        stmt = sqlite_insert(Settings.__table__).values(
+            key='custom_instructions', value=settings_update.custom_instructions
+        ).on_conflict_do_update(
+            index_elements=['key'],
+            set_=dict(value=settings_update.custom_instructions)
         )
-        settings = result.scalar_one_or_none()
-
-        if settings:
-            settings.value = settings_update.custom_instructions
-        else:
-            settings = Settings(key='custom_instructions', value=settings_update.custom_instructions)
-            session.add(settings)
+        await session.execute(stmt)
 
     await session.commit()
 
+    if settings_update.custom_instructions is not None:
+        _settings_cache['custom_instructions'] = (settings_update.custom_instructions, monotonic())
+
     return {"message": "Settings updated"}
 
 
@@ -199,7 +362,7 @@ async def update_settings(
 async def delete_item(item_id: int, session: AsyncSession = Depends(get_session)):
     """Delete a reading list item"""
     result = await session.execute(
-        select(ReadingListItem).where(ReadingListItem.id == item_id)
+        item_by_id_stmt(item_id)
     )
     item = result.scalar_one_or_none()
 
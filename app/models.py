@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -7,9 +7,13 @@ Base = declarative_base()
 
 class ReadingListItem(Base):
     __tablename__ = "reading_list_items"
+    __table_args__ = (
+        # Partial index so the unprocessed queue is found without scanning processed rows
+        Index('ix_unprocessed', 'processed', sqlite_where=text('processed = 0')),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    url = Column(String, unique=True, nullable=False, index=True)
+    url = Column(String, unique=True, nullable=False)
     title = Column(String, nullable=True)
     preview_text = Column(Text, nullable=True)
     content = Column(Text, nullable=True)
@@ -18,18 +22,20 @@ class ReadingListItem(Base):
     added_date = Column(DateTime, default=datetime.utcnow)
     processed_date = Column(DateTime, nullable=True)
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_content=True):
+        data = {
             "id": self.id,
             "url": self.url,
             "title": self.title,
             "preview_text": self.preview_text,
-            "content": self.content,
             "summary": self.summary,
             "processed": self.processed,
             "added_date": self.added_date.isoformat() if self.added_date else None,
             "processed_date": self.processed_date.isoformat() if self.processed_date else None,
         }
+        if include_content:
+            data["content"] = self.content
+        return data
 
 
 class Settings(Base):
@@ -45,3 +51,11 @@ class Settings(Base):
             "key": self.key,
             "value": self.value,
         }
+
+
+class SummaryCache(Base):
+    __tablename__ = "summary_cache"
+
+    key = Column(String, primary_key=True)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
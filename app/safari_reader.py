@@ -1,8 +1,11 @@
 import plistlib
 import os
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from datetime import datetime
 
+# Parsed reading lists keyed by (path, mtime_ns, size)
+_CACHE: Dict[Tuple[str, int, int], List[Dict]] = {}
+
 
 def extract_reading_list(bookmarks_path: str) -> List[Dict]:
     """
@@ -14,36 +17,48 @@ def extract_reading_list(bookmarks_path: str) -> List[Dict]:
     Returns:
         List of dictionaries containing reading list items
     """
-    if not os.path.exists(bookmarks_path):
+    try:
+        st = os.stat(bookmarks_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Bookmarks file not found at {bookmarks_path}")
 
+    # Skip re-parsing the plist when the file hasn't changed since the last sync
+    cache_key = (bookmarks_path, st.st_mtime_ns, st.st_size)
+    if cache_key in _CACHE:
+        return _CACHE[cache_key]
+
     with open(bookmarks_path, 'rb') as f:
         plist_data = plistlib.load(f)
 
     reading_list_items = []
 
-    def traverse_bookmarks(children):
-        """Recursively traverse bookmark structure to find reading list"""
-        for item in children:
-            if item.get('Title') == 'com.apple.ReadingList':
-                # Found the reading list folder
-                if 'Children' in item:
-                    for reading_item in item['Children']:
-                        url_string = reading_item.get('URLString', '')
-                        reading_list_dict = reading_item.get('ReadingList', {})
-
-                        reading_list_items.append({
-                            'url': url_string,
-                            'title': reading_item.get('URIDictionary', {}).get('title', ''),
-                            'preview_text': reading_list_dict.get('PreviewText', ''),
-                            'added_date': reading_list_dict.get('DateAdded'),
-                        })
-            elif 'Children' in item:
-                # Continue traversing
-                traverse_bookmarks(item['Children'])
-
-    if 'Children' in plist_data:
-        traverse_bookmarks(plist_data['Children'])
+    # Walk the bookmark tree depth-first with an explicit stack of iterators
+    stack = [iter(plist_data.get('Children', []))]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        if item.get('Title') == 'com.apple.ReadingList':
+            # Found the reading list folder
+            for reading_item in item.get('Children', []):
+                url_string = reading_item.get('URLString', '')
+                reading_list_dict = reading_item.get('ReadingList', {})
+
+                reading_list_items.append({
+                    'url': url_string,
+                    'title': reading_item.get('URIDictionary', {}).get('title', ''),
+                    'preview_text': reading_list_dict.get('PreviewText', ''),
+                    'added_date': reading_list_dict.get('DateAdded'),
+                })
+        elif 'Children' in item:
+            # Continue traversing
+            stack.append(iter(item['Children']))
+
+    # Only the latest parse is worth keeping
+    _CACHE.clear()
+    _CACHE[cache_key] = reading_list_items
 
     return reading_list_items
 
@@ -99,10 +99,27 @@ async function processItem(itemId) {
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ item_id: itemId, reprocess: true })
         });
-        const result = await response.json();
 
-        if (result.errors && result.errors.length > 0) {
-            alert(`Processing errors:\n${result.errors.join('\n')}`);
+        if (!response.ok) {
+            const result = await response.json();
+            alert(`Processing errors:\n${result.detail}`);
+            return;
+        }
+
+        // The summary is streamed back as server-sent events
+        let summary = '';
+        const errors = [];
+        await readEventStream(response, (event, data) => {
+            if (event === 'error') {
+                errors.push(data);
+            } else if (event === 'message') {
+                summary += data;
+                renderStreamingSummary(card, summary);
+            }
+        });
+
+        if (errors.length > 0) {
+            alert(`Processing errors:\n${errors.join('\n')}`);
         }
 
         await loadItems();
@@ -114,6 +131,46 @@ async function processItem(itemId) {
     }
 }
 
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop();
+
+        for (const frame of frames) {
+            let event = 'message';
+            const data = [];
+            for (const line of frame.split('\n')) {
+                if (line.startsWith('event: ')) {
+                    event = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    data.push(line.slice(6));
+                }
+            }
+            onEvent(event, data.join('\n'));
+        }
+    }
+}
+
+function renderStreamingSummary(card, summary) {
+    let paragraph = card.querySelector('.item-summary p');
+    if (!paragraph) {
+        const container = document.createElement('div');
+        container.className = 'item-summary';
+        container.innerHTML = '<h3>Summary</h3><p></p>';
+        card.appendChild(container);
+        paragraph = container.querySelector('p');
+    }
+    paragraph.textContent = summary;
+}
+
 async function deleteItem(itemId) {
     if (!confirm('Are you sure you want to delete this item?')) {
         return;
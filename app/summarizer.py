@@ -1,12 +1,102 @@
-import requests
-from bs4 import BeautifulSoup
-from anthropic import Anthropic
+import asyncio
+import hashlib
+import httpx
+import tiktoken
+from anthropic import AsyncAnthropic
 import os
-from typing import Optional
-from openai import OpenAI
-
-
-def fetch_webpage_content(url: str, timeout: int = 10) -> Optional[str]:
+import re
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+from openai import AsyncOpenAI
+from selectolax.parser import HTMLParser
+
+
+DEFAULT_INSTRUCTIONS = (
+    "Please provide a concise summary of the following content. "
+    "Focus on the main points, key takeaways, and any important insights."
+)
+
+# Model used for each provider when LLM_MODEL isn't set
+DEFAULT_MODELS = {
+    'github': "gpt-4o",
+    'anthropic': "claude-3-5-sonnet-20241022",
+    'openai': "gpt-4o",
+}
+
+# Environment variable and display name of the API key for each provider
+API_KEY_ENV_VARS = {
+    'github': 'GITHUB_TOKEN',
+    'anthropic': 'ANTHROPIC_API_KEY',
+    'openai': 'OPENAI_API_KEY',
+}
+API_KEY_NAMES = {
+    'github': "GitHub token",
+    'anthropic': "Anthropic API key",
+    'openai': "OpenAI API key",
+}
+
+# Whitespace between extracted text fragments
+_WS = re.compile(r'\s*\n\s*|[ \t]{2,}')
+
+# Maximum number of content tokens sent to the model
+MAX_CONTENT_TOKENS = 100000
+
+
+# Shared HTTP client so connections are pooled across fetches
+_client = httpx.AsyncClient(
+    headers={
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    },
+    follow_redirects=True,
+    http2=True,
+)
+
+
+# LLM clients keyed by (provider, api_key), reused so their connection pools are shared
+_llm_clients: Dict[Tuple[str, str], Union[AsyncAnthropic, AsyncOpenAI]] = {}
+
+
+async def close_http_client():
+    """Close the shared HTTP and LLM clients"""
+    await _client.aclose()
+    for client in _llm_clients.values():
+        await client.close()
+    _llm_clients.clear()
+
+
+def _get_llm_client(provider: str, api_key: str) -> Union[AsyncAnthropic, AsyncOpenAI]:
+    """Get or create the async client for a provider"""
+    key = (provider, api_key)
+    if key not in _llm_clients:
+        if provider == 'github':
+            _llm_clients[key] = AsyncOpenAI(
+                base_url="https://models.github.ai/inference",
+                api_key=api_key
+            )
+        elif provider == 'anthropic':
+            _llm_clients[key] = AsyncAnthropic(api_key=api_key)
+        else:
+            _llm_clients[key] = AsyncOpenAI(api_key=api_key)
+    return _llm_clients[key]
+
+
+def _parse_html(html: bytes) -> str:
+    """Extract readable text from raw HTML"""
+    tree = HTMLParser(html)
+
+    # Remove script and style elements
+    tree.strip_tags(['script', 'style', 'nav', 'header', 'footer'])
+
+    root = tree.body or tree.root
+    if root is None:
+        return ''
+
+    # Get text and collapse blank lines and runs of spaces into single line breaks
+    text = root.text(separator='\n', strip=True)
+    return _WS.sub('\n', text).strip()
+
+
+async def fetch_webpage_content(url: str, timeout: int = 10) -> Optional[str]:
     """
     Fetch and extract text content from a webpage.
 
@@ -18,159 +108,263 @@ def fetch_webpage_content(url: str, timeout: int = 10) -> Optional[str]:
         Extracted text content or None if failed
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = await _client.get(url, timeout=timeout)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'lxml')
+        # Parsing is CPU-bound, so keep it off the event loop
+        return await asyncio.to_thread(_parse_html, response.content)
 
-        # Remove script and style elements
-        for script in soup(['script', 'style', 'nav', 'header', 'footer']):
-            script.decompose()
+    except Exception as e:
+        print(f"Error fetching {url}: {e}")
+        return None
 
-        # Get text
-        text = soup.get_text(separator='\n', strip=True)
 
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = '\n'.join(chunk for chunk in chunks if chunk)
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    """
+    Get the tokenizer for a model.
 
-        return text
+    Models tiktoken doesn't know fall back to cl100k_base. That includes Anthropic
+    models and any OpenAI model newer than the installed tiktoken, so counts for
+    those are an approximation.
 
+    Returns:
+        The tokenizer, or None if its data couldn't be loaded (e.g. offline host).
+        The result is cached either way, so a failed download isn't retried.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
     except Exception as e:
-        print(f"Error fetching {url}: {e}")
+        print(f"Error loading tokenizer for {model}: {e}")
         return None
 
 
-def summarize_with_llm(
-    content: str,
+def load_tokenizer():
+    """
+    Load the tokenizer for the configured model ahead of time.
+
+    tiktoken downloads its BPE data on first use, so doing this at startup keeps
+    that request out of the first summarization. If loading fails,
+    truncate_to_tokens falls back to a byte-based cut.
+    """
+    try:
+        _, model, _ = _resolve_settings()
+    except ValueError as e:
+        print(f"Error loading tokenizer: {e}")
+        return
+    _get_encoding(model)
+
+
+def truncate_to_tokens(content: str, model: str, max_tokens: int = MAX_CONTENT_TOKENS) -> str:
+    """
+    Truncate content to at most max_tokens tokens.
+
+    Args:
+        content: Text content to truncate
+        model: Model name used to pick the tokenizer
+        max_tokens: Maximum number of tokens to keep
+
+    Returns:
+        Original content if within the limit, otherwise the decoded token prefix
+    """
+    # Every token covers at least one UTF-8 byte, so content this short can't exceed the limit
+    if len(content.encode('utf-8')) <= max_tokens:
+        return content
+
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # No tokenizer available, so cut by bytes instead, which never leaves
+        # more than max_tokens tokens
+        truncated = content.encode('utf-8')[:max_tokens].decode('utf-8', errors='ignore')
+        return truncated + "\n\n[Content truncated due to length...]"
+
+    tokens = encoding.encode(content, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return content
+
+    return encoding.decode(tokens[:max_tokens]) + "\n\n[Content truncated due to length...]"
+
+
+def _resolve_settings(
     custom_instructions: Optional[str] = None,
-    api_key: Optional[str] = None,
     provider: Optional[str] = None,
     model: Optional[str] = None
-) -> str:
+) -> Tuple[str, str, str]:
     """
-    Summarize content using an LLM (supports GitHub Models, Anthropic Claude, or OpenAI).
+    Resolve the provider, model and instructions for a summarization request.
 
-    Args:
-        content: Text content to summarize
-        custom_instructions: Optional custom instructions for summarization
-        api_key: API key (falls back to env var)
-        provider: LLM provider ('github', 'anthropic', 'openai')
-        model: Model name to use
+    Unset values fall back to LLM_PROVIDER/LLM_MODEL and then to the defaults.
 
     Returns:
-        Summary text
+        Tuple of (provider, model, instructions)
     """
     # Get provider and model from env if not specified
     if not provider:
         provider = os.getenv('LLM_PROVIDER', 'github')
 
+    if provider not in API_KEY_ENV_VARS:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
     if not model:
-        model = os.getenv('LLM_MODEL')
+        model = os.getenv('LLM_MODEL') or DEFAULT_MODELS[provider]
 
-    default_instructions = (
-        "Please provide a concise summary of the following content. "
-        "Focus on the main points, key takeaways, and any important insights."
-    )
+    instructions = custom_instructions if custom_instructions else DEFAULT_INSTRUCTIONS
 
-    instructions = custom_instructions if custom_instructions else default_instructions
+    return provider, model, instructions
 
-    # Truncate content if too long
-    max_chars = 400000
-    if len(content) > max_chars:
-        content = content[:max_chars] + "\n\n[Content truncated due to length...]"
 
-    prompt = f"{instructions}\n\nContent:\n\n{content}"
+def summary_cache_key(
+    content: str,
+    custom_instructions: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None
+) -> str:
+    """
+    Build a deterministic cache key for a summarization request.
+
+    Uses the same settings resolution as summarize_with_llm, so identical
+    requests map to the same key.
+
+    Returns:
+        Hex SHA-256 digest of provider, model, instructions and content
+    """
+    provider, model, instructions = _resolve_settings(custom_instructions, provider, model)
+
+    return hashlib.sha256(f"{provider}|{model}|{instructions}|{content}".encode()).hexdigest()
 
-    if provider == 'github':
-        # GitHub Models API (OpenAI-compatible)
-        if not api_key:
-            api_key = os.getenv('GITHUB_TOKEN')
 
-        if not api_key:
-            raise ValueError("GitHub token not provided")
+async def _prepare_request(
+    content: str,
+    custom_instructions: Optional[str],
+    api_key: Optional[str],
+    provider: Optional[str],
+    model: Optional[str]
+) -> Tuple[str, Union[AsyncAnthropic, AsyncOpenAI], str, str, str]:
+    """
+    Resolve provider settings and build the pieces of a summarization request.
+
+    Returns:
+        Tuple of (provider, client, model, system prompt, truncated content)
+    """
+    provider, model, instructions = _resolve_settings(custom_instructions, provider, model)
 
-        if not model:
-            model = "gpt-4o"  # Default GitHub model
+    if not api_key:
+        api_key = os.getenv(API_KEY_ENV_VARS[provider])
 
-        client = OpenAI(
-            base_url="https://models.github.ai/inference",
-            api_key=api_key
-        )
+    if not api_key:
+        raise ValueError(f"{API_KEY_NAMES[provider]} not provided")
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes articles."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1024,
-            temperature=0.7
-        )
+    # Tokenizing a long page is CPU-bound, so keep it off the event loop
+    content = await asyncio.to_thread(truncate_to_tokens, content, model)
 
-        return response.choices[0].message.content
+    # Keep the instructions in a stable system prefix so providers can cache it;
+    # only the per-article content varies between calls
+    system_prompt = f"You are a helpful assistant that summarizes articles.\n\n{instructions}"
 
-    elif provider == 'anthropic':
-        # Anthropic Claude API
-        if not api_key:
-            api_key = os.getenv('ANTHROPIC_API_KEY')
+    return provider, _get_llm_client(provider, api_key), model, system_prompt, content
 
-        if not api_key:
-            raise ValueError("Anthropic API key not provided")
 
-        if not model:
-            model = "claude-3-5-sonnet-20241022"
+def _anthropic_params(model: str, system_prompt: str, content: str) -> Dict:
+    """Request parameters for the Anthropic Messages API"""
+    return dict(
+        model=model,
+        max_tokens=1024,
+        system=[
+            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+        ],
+        messages=[
+            {"role": "user", "content": content}
+        ]
+    )
 
-        client = Anthropic(api_key=api_key)
 
-        message = client.messages.create(
-            model=model,
-            max_tokens=1024,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
-        )
+def _openai_params(model: str, system_prompt: str, content: str) -> Dict:
+    """Request parameters for the OpenAI-compatible Chat Completions API"""
+    return dict(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content}
+        ],
+        max_tokens=1024,
+        temperature=0.7
+    )
+
+
+async def summarize_with_llm(
+    content: str,
+    custom_instructions: Optional[str] = None,
+    api_key: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None
+) -> str:
+    """
+    Summarize content using an LLM (supports GitHub Models, Anthropic Claude, or OpenAI).
 
+    Args:
+        content: Text content to summarize
+        custom_instructions: Optional custom instructions for summarization
+        api_key: API key (falls back to env var)
+        provider: LLM provider ('github', 'anthropic', 'openai')
+        model: Model name to use
+
+    Returns:
+        Summary text
+    """
+    provider, client, model, system_prompt, content = await _prepare_request(
+        content, custom_instructions, api_key, provider, model
+    )
+
+    if provider == 'anthropic':
+        message = await client.messages.create(**_anthropic_params(model, system_prompt, content))
         return message.content[0].text
 
-    elif provider == 'openai':
-        # OpenAI API
-        if not api_key:
-            api_key = os.getenv('OPENAI_API_KEY')
+    # GitHub Models and OpenAI share the OpenAI-compatible API
+    response = await client.chat.completions.create(**_openai_params(model, system_prompt, content))
+    return response.choices[0].message.content
 
-        if not api_key:
-            raise ValueError("OpenAI API key not provided")
 
-        if not model:
-            model = "gpt-4o"
+async def stream_summary_with_llm(
+    content: str,
+    custom_instructions: Optional[str] = None,
+    api_key: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Summarize content using an LLM, yielding the summary text as it is generated.
 
-        client = OpenAI(api_key=api_key)
+    Takes the same arguments as summarize_with_llm.
 
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes articles."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=1024,
-            temperature=0.7
-        )
+    Yields:
+        Chunks of summary text
+    """
+    provider, client, model, system_prompt, content = await _prepare_request(
+        content, custom_instructions, api_key, provider, model
+    )
 
-        return response.choices[0].message.content
+    if provider == 'anthropic':
+        async with client.messages.stream(**_anthropic_params(model, system_prompt, content)) as stream:
+            async for text in stream.text_stream:
+                yield text
+        return
 
-    else:
-        raise ValueError(f"Unknown LLM provider: {provider}")
+    response = await client.chat.completions.create(
+        **_openai_params(model, system_prompt, content), stream=True
+    )
+    async for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
 
 
 # Keep backwards compatibility
-def summarize_with_claude(
+async def summarize_with_claude(
     content: str,
     custom_instructions: Optional[str] = None,
     api_key: Optional[str] = None
 ) -> str:
     """Legacy function for backwards compatibility."""
-    return summarize_with_llm(content, custom_instructions, api_key, provider='anthropic')
+    return await summarize_with_llm(content, custom_instructions, api_key, provider='anthropic')
@@ -0,0 +1,95 @@
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+import os
+
+from app.database import async_session_maker
+from app.models import SummaryCache
+from app.summarizer import stream_summary_with_llm, summarize_with_llm, summary_cache_key
+
+# How long a cached summary stays valid, in seconds
+SUMMARY_CACHE_TTL = int(os.getenv('SUMMARY_CACHE_TTL', 3600))
+
+
+async def get_cached_summary(key: str) -> Optional[str]:
+    """
+    Look up a previously generated summary.
+
+    Args:
+        key: Cache key from summary_cache_key
+
+    Returns:
+        Cached summary text or None if missing or expired
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=SUMMARY_CACHE_TTL)
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(SummaryCache.summary).where(
+                SummaryCache.key == key,
+                SummaryCache.created_at > cutoff
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def store_cached_summary(key: str, summary: str):
+    """
+    Store a generated summary, replacing any previous entry for the key.
+
+    Expired entries are deleted in the same transaction so the table doesn't grow
+    without bound.
+
+    Args:
+        key: Cache key from summary_cache_key
+        summary: Summary text to cache
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=SUMMARY_CACHE_TTL)
+    stmt = sqlite_insert(SummaryCache.__table__).values(
+        key=key, summary=summary, created_at=now
+    ).on_conflict_do_update(
+        index_elements=['key'],
+        set_=dict(summary=summary, created_at=now)
+    )
+
+    async with async_session_maker() as session:
+        await session.execute(delete(SummaryCache).where(SummaryCache.created_at <= cutoff))
+        await session.execute(stmt)
+        await session.commit()
+
+
+async def cached_summary(
+    content: str,
+    custom_instructions: Optional[str] = None,
+    stream: bool = False
+) -> AsyncIterator[str]:
+    """
+    Summarize content, reusing a cached summary for identical input.
+
+    Args:
+        content: Text content to summarize
+        custom_instructions: Optional custom instructions for summarization
+        stream: Yield the summary as it is generated instead of in one chunk
+
+    Yields:
+        Chunks of summary text; a cached summary is yielded as a single chunk
+    """
+    key = summary_cache_key(content, custom_instructions)
+    summary = await get_cached_summary(key)
+    if summary is not None:
+        yield summary
+        return
+
+    if stream:
+        chunks = []
+        async for text in stream_summary_with_llm(content, custom_instructions):
+            chunks.append(text)
+            yield text
+        summary = "".join(chunks)
+    else:
+        summary = await summarize_with_llm(content, custom_instructions)
+        yield summary
+
+    await store_cached_summary(key, summary)